@@ -1,10 +1,31 @@
 import sounddevice as sd
 import numpy as np
-import librosa
-import sounddevice as sd
-import numpy as np
 import parselmouth
 import csv
+from functools import lru_cache
+from numba import njit
+
+_rng = np.random.default_rng()
+
+@lru_cache(maxsize=64)
+def _hamming(N):
+    # Shared between calls; callers must not modify it in place
+    return np.hamming(N)
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _ks_kernel(buf, N, n_samples, decay):
+    out = np.empty(n_samples, dtype=np.float64)
+
+    # Ring buffer: head points at the oldest sample, which is overwritten in place
+    head = 0
+    for i in range(n_samples):
+        nxt = head + 1 if head + 1 < N else 0
+        avg = decay * 0.5 * (buf[head] + buf[nxt])
+        out[i] = avg
+        buf[head] = avg
+        head = nxt
+
+    return out
 
 def karplus_strong(
     freq,
@@ -17,17 +38,9 @@ def karplus_strong(
     N = int(sample_rate / freq)
     
     # Initial buffer with brightness shaping
-    buf = (np.random.rand(N) - 0.5) * 2
-    buf = buf * brightness + (1 - brightness) * np.hamming(N)
-
-    samples = []
+    buf = _rng.uniform(-brightness, brightness, N) + (1 - brightness) * _hamming(N)
 
-    for _ in range(int(sample_rate * duration)):
-        avg = decay * 0.5 * (buf[0] + buf[1])
-        samples.append(avg)
-        buf = np.append(buf[1:], avg)
-
-    waveform = np.array(samples)
+    waveform = _ks_kernel(buf, N, int(sample_rate * duration), decay)
     
     # Apply volume scaling and prevent clipping
     waveform *= volume / np.max(np.abs(waveform))
@@ -39,10 +52,17 @@ def play(pitch):
     sd.play(note, samplerate=44100)
     sd.wait()
 
+# Reused across recordings; the returned audio is a view that the next call overwrites
+_rec_buf = np.empty((int(1.0 * 44100), 1), dtype=np.float32)
+
 def record_audio(duration=1.0, samplerate=44100):
-    audio = sd.rec(int(duration * samplerate), samplerate=samplerate, channels=1, dtype='float32')
+    global _rec_buf
+    frames = int(duration * samplerate)
+    if _rec_buf.shape[0] != frames:
+        _rec_buf = np.empty((frames, 1), dtype=np.float32)
+    sd.rec(samplerate=samplerate, out=_rec_buf)
     sd.wait()
-    return audio.flatten(), samplerate
+    return _rec_buf[:, 0], samplerate
 
 def detect_pitch_parselmouth(audio, sr, time_step=0.01, pitch_floor=50, pitch_ceiling=500):
     snd = parselmouth.Sound(audio, sampling_frequency=sr)
@@ -66,22 +86,29 @@ def test_parselmouth_pitch():
     else:
         print("No pitch detected. Try again.")
 
-def record_audio(duration=1.0, samplerate=44100):
-    audio = sd.rec(int(duration * samplerate), samplerate=samplerate, channels=1, dtype='float64')
-    sd.wait()
-    return audio.flatten(), samplerate
-
-def detect_pitch(audio, sr, pitch_floor=50, pitch_ceiling=500, min_accepted_pitch=75):
-    snd = parselmouth.Sound(audio, sampling_frequency=sr)
-    pitch = snd.to_pitch(pitch_floor=pitch_floor, pitch_ceiling=pitch_ceiling)
-    freqs = pitch.selected_array['frequency']
-    freqs = freqs[freqs > 0]
-    if len(freqs) == 0:
+def detect_pitch(audio, sr, pitch_floor=50, pitch_ceiling=500, min_accepted_pitch=75, voicing_threshold=0.45):
+    # Autocorrelation via FFT, zero-padded to avoid wrap-around. No taper window: a pluck
+    # decays over the recording and a window would suppress its strongest part
+    x = audio - np.mean(audio)
+    X = np.fft.rfft(x, n=2 * len(x))
+    acf = np.fft.irfft(X * np.conj(X))[:len(x) // 2]
+    if acf[0] <= 0:
         return None
-    median_freq = float(np.median(freqs))
-    if median_freq < min_accepted_pitch:
+
+    lag_min = int(sr // pitch_ceiling)
+    lag_max = min(int(sr // pitch_floor), len(acf) - 2)
+    lag = lag_min + int(np.argmax(acf[lag_min:lag_max + 1]))
+    if acf[lag] < voicing_threshold * acf[0]:
+        return None  # Unvoiced / no clear periodicity
+
+    # Parabolic interpolation around the peak for sub-sample lag resolution
+    y0, y1, y2 = acf[lag - 1], acf[lag], acf[lag + 1]
+    denom = y0 - 2 * y1 + y2
+    shift = 0.5 * (y0 - y2) / denom if denom != 0 else 0.0
+    freq = float(sr / (lag + shift))
+    if freq < min_accepted_pitch:
         return None  # Filter out pitches below threshold
-    return median_freq
+    return freq
 
 def capture_pitch_groups(n_groups=12):
     all_groups = []
@@ -112,8 +139,9 @@ def capture_pitch_groups(n_groups=12):
 
     return all_groups
 
-pitch_groups = capture_pitch_groups(n_groups=24)
-with open('pitches.csv', 'w', newline='') as f:
-    writer = csv.writer(f)
-    writer.writerows(pitch_groups)
-print(pitch_groups)
\ No newline at end of file
+if __name__ == '__main__':
+    pitch_groups = capture_pitch_groups(n_groups=24)
+    with open('pitches.csv', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerows(pitch_groups)
+    print(pitch_groups)
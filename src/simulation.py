@@ -2,16 +2,34 @@ import math
 import numpy as np
 import sounddevice as sd
 import pandas as pd
-from scipy.optimize import minimize
-from scipy.optimize import minimize_scalar
+from scipy.optimize import minimize, Bounds, BFGS
 import csv
 import parselmouth
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from collections import deque
 from scipy.signal import butter, lfilter
+from numba import njit
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from calibration_data import karplus_strong
 
-MAX_PENALTY = 1e5
+# A slack string (negative tension) is given a negative frequency, sign(T) * sqrt(|T| / mu) / (2L),
+# so errors keep growing and gradients keep pointing back towards positive tension. |T| is
+# floored to keep the derivative finite at zero.
+MIN_TENSION = 1e-12
+
+# Worker-side view of the calibration data, attached once per worker by _attach_real_data
+_real_data_shm = None
+_real_data = None
+
+def _attach_real_data(name, shape):
+    global _real_data_shm, _real_data
+    _real_data_shm = SharedMemory(name=name)
+    _real_data = np.ndarray(shape, dtype=np.float64, buffer=_real_data_shm.buf)
+
+def _cost_on_shared_data(cost, parameters):
+    return cost(_real_data, Guitar(parameters))
 
 def in2m(inches):
     return inches * 0.0254
@@ -31,13 +49,19 @@ class Guitar:
         self.r_str = params[i]; i += 1
         self.r_spr = params[i]; i += 1
         self.k_spr = params[i]; i += 1
-        self.k_str = params[i]; i += 1
-        self.T_str0 = params[i]; i += 1
-        self.scale_length = params[i]; i += 1
-        self.lin_mass_density = params[i]; i += 1
+        self.k_str = np.asarray(params[i], dtype=float); i += 1
+        self.T_str0 = np.asarray(params[i], dtype=float); i += 1
+        self.scale_length = np.asarray(params[i], dtype=float); i += 1
+        self.lin_mass_density = np.asarray(params[i], dtype=float); i += 1
 
-        self.T_spr0 = np.sum(self.T_str0) * self.r_str / self.r_spr
+        self.T_str0_sum = float(np.sum(self.T_str0))
+        self.T_spr0 = self.T_str0_sum * self.r_str / self.r_spr
         self.k_str_total = np.sum(self.k_str)
+
+        # Offset-independent parts of the bridge equilibrium
+        self._eq_denom = self.r_spr * self.k_spr + self.r_str * self.k_str_total
+        self._eq_num_const = self.r_spr * self.T_spr0 - self.r_str * self.T_str0_sum
+        self._r_str_over_denom = self.r_str / self._eq_denom
             
     @classmethod 
     def default_measurements(cls):
@@ -58,18 +82,12 @@ class Guitar:
         lever_ratio = r_str / r_spr
 
         # derive mu and k (string linear mass density and string stiffness constant)
-        lin_mass_density = [0] * 6
-        k_str = [0] * 6
-        for i in range(6):
-            diameter = diameters[i]
-            area = math.pi * (diameter / 2)**2
-            lin_mass_density[i] = area * string_density
-            k_str[i] = E * area / scale_length[i]
+        area = math.pi * (diameters / 2)**2
+        lin_mass_density = area * string_density
+        k_str = E * area / scale_length
 
         # Calculate intitial tension assuming bridge is centered at tuned state
-        T_str0 = [0] * 6
-        for i in range(6):
-            T_str0[i] = (2 * scale_length[i] * balanced_freq[i])**2 * lin_mass_density[i]
+        T_str0 = (2 * scale_length * balanced_freq)**2 * lin_mass_density
 
         T_spr0 = sum(T_str0) * r_str / r_spr
         return r_str, r_spr, k_spr, k_str, T_str0, scale_length, lin_mass_density
@@ -86,119 +104,165 @@ class Guitar:
         ]
 
     def flatten(self):
-        x = np.array(
-            [self.r_str] +
-            [self.r_spr] +
-            [self.k_spr] +
-            list(self.k_str) +
-            list(self.T_str0) +
-            list(self.scale_length) +
-            list(self.lin_mass_density)
-        )
+        x = np.concatenate((
+            [self.r_str, self.r_spr, self.k_spr],
+            self.k_str,
+            self.T_str0,
+            self.scale_length,
+            self.lin_mass_density
+        ))
         return x
 
     @classmethod
     def reshape(cls, arr):
         assert len(arr) == 27
+        arr = np.asarray(arr, dtype=float)
         return arr[0], arr[1], arr[2], arr[3:3+6], arr[9:9+6], arr[15:15+6], arr[21:21+6]
 
+# Both accept a single set of offsets or a stack of them (one per row)
 def find_equilibrium(current_offsets, guitar):
-    spring_term = guitar.k_spr * (guitar.r_str / guitar.r_spr) * guitar.r_spr
-    modified_tension = sum(guitar.T_str0 + guitar.k_str * current_offsets)
-    x = (
-        (guitar.r_spr * guitar.T_spr0 - guitar.r_str * modified_tension) 
-        /
-        (guitar.r_spr * guitar.k_spr + guitar.r_str * guitar.k_str_total)
-    )
-    return x
+    return (guitar._eq_num_const - guitar.r_str * (np.asarray(current_offsets) @ guitar.k_str)) / guitar._eq_denom
 
 def calculate_frequencies(x_eq, current_offsets, guitar):
-    calculated_freqs = np.zeros(6)
-    
-    for i in range(6):
-        L_new = guitar.scale_length[i] + x_eq
-        T_new = guitar.T_str0[i] + guitar.k_str[i] * (x_eq + current_offsets[i])
-        
-        if T_new < 0 or guitar.lin_mass_density[i] < 0:
-            return None
-
-        freq = (1 / (2 * L_new)) * math.sqrt(T_new / guitar.lin_mass_density[i])
-        calculated_freqs[i] = freq
-        
+    x_eq = np.asarray(x_eq)[..., None]
+    L_new = guitar.scale_length + x_eq
+    T_new = guitar.T_str0 + guitar.k_str * (x_eq + np.asarray(current_offsets))
+    calculated_freqs = np.sign(T_new) * np.sqrt(np.abs(T_new) / guitar.lin_mass_density) / (2 * L_new)
     return calculated_freqs
 
+@njit(inline='always')
+def _equilibrium(offsets, r_str, k_str, eq_num_const, eq_denom):
+    offset_tension = 0.0
+    for i in range(offsets.shape[0]):
+        offset_tension += k_str[i] * offsets[i]
+    return (eq_num_const - r_str * offset_tension) / eq_denom
+
+@njit(cache=True, fastmath=True)
+def _residual_sq(offsets, target, r_str, k_str, T_str0, scale_length, mu, eq_num_const, eq_denom):
+    x_eq = _equilibrium(offsets, r_str, k_str, eq_num_const, eq_denom)
+
+    error = 0.0
+    for i in range(offsets.shape[0]):
+        T_new = T_str0[i] + k_str[i] * (x_eq + offsets[i])
+        freq = math.copysign(math.sqrt(abs(T_new) / mu[i]), T_new) / (2 * (scale_length[i] + x_eq))
+        error += (freq - target[i])**2
+    return error
+
+@njit(cache=True, fastmath=True)
+def _residual_sq_grad(offsets, target, r_str, k_str, T_str0, scale_length, mu, eq_num_const, eq_denom):
+    n = offsets.shape[0]
+    x_eq = _equilibrium(offsets, r_str, k_str, eq_num_const, eq_denom)
+    grad = np.zeros(n)
+
+    # Both L_new and T_new are affine in the offsets, so d(freq_i)/d(offset_j) is closed form:
+    # f_i * (0.5 * k_i * (dx_j + [i == j]) / T_i - dx_j / L_i) with dx_j = -r_str * k_j / denominator
+    error = 0.0
+    shared = 0.0
+    for i in range(n):
+        L_new = scale_length[i] + x_eq
+        T_new = T_str0[i] + k_str[i] * (x_eq + offsets[i])
+        T_abs = max(abs(T_new), MIN_TENSION)
+        freq = math.copysign(math.sqrt(abs(T_new) / mu[i]), T_new) / (2 * L_new)
+        residual = freq - target[i]
+        error += residual**2
+        dfreq_dT = 0.5 * abs(freq) / T_abs
+        shared += residual * (dfreq_dT * k_str[i] - freq / L_new)
+        grad[i] = 2 * residual * dfreq_dT * k_str[i]
+
+    dx_scale = -r_str / eq_denom
+    for j in range(n):
+        grad[j] += 2 * dx_scale * k_str[j] * shared
+    return error, grad
+
+def _kernel_args(current_offsets, target_freq, guitar):
+    return (
+        np.asarray(current_offsets, dtype=np.float64),
+        np.asarray(target_freq, dtype=np.float64),
+        guitar.r_str, guitar.k_str, guitar.T_str0, guitar.scale_length, guitar.lin_mass_density,
+        guitar._eq_num_const, guitar._eq_denom
+    )
+
 def objective_function(current_offsets, target_freq, guitar):
-    x_eq = find_equilibrium(current_offsets, guitar)
-    calculated_freqs = calculate_frequencies(x_eq, current_offsets, guitar)
-    if calculated_freqs is None:
-        return MAX_PENALTY
     # Sum of squared differences between calculated and target frequencies
-    error = sum((calculated_freqs[i] - target_freq[i])**2 for i in range(6))
-    return error
+    return _residual_sq(*_kernel_args(current_offsets, target_freq, guitar))
+
+def objective_and_grad(current_offsets, target_freq, guitar):
+    return _residual_sq_grad(*_kernel_args(current_offsets, target_freq, guitar))
 
 def tune_all_targets(target_freq, guitar, initial_offset=None):
-    initial_offset = initial_offset or [0] * 6
+    initial_offset = np.zeros(6) if initial_offset is None else initial_offset
 
     # Run optimization
     result = minimize(
-        lambda x: objective_function(x, target_freq, guitar), 
-        initial_offset, 
-        method='Nelder-Mead',
+        objective_and_grad,
+        initial_offset,
+        args=(target_freq, guitar),
+        method='L-BFGS-B',
+        jac=True,
         options={
             'maxiter': 10000,
-            'maxfev': 20000,
-            'xatol': 1e-16,
-            'fatol': 1e-16,
-            'disp': False
+            'ftol': 1e-16,
+            'gtol': 1e-16
         }
     )
     
     return result.x
 
+# Starting offsets for each target: its solution for the default Guitar. They depend only on
+# the target, so the inner solves give the same result in every pool worker regardless of what
+# it ran before, while still starting close to the answer as optimize_parameters moves.
+_offset_seeds = {}
+
+def tune_all_targets_seeded(target_freq, guitar):
+    key = tuple(target_freq)
+    if key not in _offset_seeds:
+        _offset_seeds[key] = tune_all_targets(target_freq, Guitar())
+    return tune_all_targets(target_freq, guitar, initial_offset=_offset_seeds[key])
+
 def single_objective_function(current_offsets, str_n, target_freq, guitar):
     x_eq = find_equilibrium(current_offsets, guitar)
     calculated_freqs = calculate_frequencies(x_eq, current_offsets, guitar)
-    if calculated_freqs is None:
-        return MAX_PENALTY
-    
+
     # Sum of squared differences between calculated and target frequencies
     error = (calculated_freqs[str_n] - target_freq)**2 
     
     return error
 
 def tune_one_target(target_freq, str_n, guitar, initial_offset):
-    # Run optimization
-    
-    def cost(offset):
-        current_offsets = initial_offset.copy()
-        current_offsets[str_n] = offset
-        return single_objective_function(current_offsets, str_n, target_freq, guitar)
-
-    a = initial_offset[str_n] - 0.001 
+    # With the other offsets fixed, x_eq = A - B * offset and freq(offset) = target
+    # reduces to a quadratic in the offset
+    current_offsets = np.array(initial_offset, dtype=float)
+    current_offsets[str_n] = 0
+    A = find_equilibrium(current_offsets, guitar)
+    B = guitar._r_str_over_denom * guitar.k_str[str_n]
+
+    k = guitar.k_str[str_n]
+    P = guitar.scale_length[str_n] + A
+    c = 4 * target_freq**2 * guitar.lin_mass_density[str_n]
+    a1 = -(2 * c * P * B + k * (1 - B))
+    a0 = c * P**2 - (guitar.T_str0[str_n] + k * A)
+    disc = max(a1**2 - 4 * c * B**2 * a0, 0)
+
+    # Smaller root is the one with positive string length; freq is monotonic in the
+    # offset so clipping gives the bounded least-squares solution
+    offset = 2 * a0 / (-a1 + math.sqrt(disc))
+
+    a = initial_offset[str_n] - 0.001
     b = initial_offset[str_n] + 0.001
 
-    result = minimize_scalar(
-        cost,
-        method='bounded',
-        bounds=(a, b),
-        options={
-            'xatol': 1e-16, 
-            'maxiter': 1000
-        }
-    )
-
     ret = initial_offset.copy()
-    ret[str_n] = result.x
+    ret[str_n] = min(max(offset, a), b)
 
     return ret
 
 def play_tuned_strings(freqs):
-    for i in range(6):
-        freq = freqs[i]
-        print(f"Playing String {i+1} at {freq:.2f} Hz")
-        note = karplus_strong(freq=freq, duration=1.0, decay=0.99, brightness=0.8, volume=0.5)
-        sd.play(note, samplerate=44100)
-        sd.wait()
+    # One stream for all six notes; write() blocks until each note is queued
+    with sd.OutputStream(samplerate=44100, channels=1, dtype='float32') as stream:
+        for i in range(6):
+            freq = freqs[i]
+            print(f"Playing String {i+1} at {freq:.2f} Hz")
+            note = karplus_strong(freq=freq, duration=1.0, decay=0.99, brightness=0.8, volume=0.5)
+            stream.write(note.astype(np.float32))
 
 # Assume data is generated by turning string 1, 2, 3, 4, 5, 6, 1, 2, 3, 4, 5, 6, ...
 def generate_artificial_data(real_data, guitar):
@@ -234,12 +298,11 @@ def cost1(real_data, guitar):
 
     starting_freq = real_data[0]
     #print('T_str0 ', guitar.T_str0)
-    offsets = tune_all_targets(starting_freq, guitar)
+    offsets = tune_all_targets_seeded(starting_freq, guitar)
     starting_x = find_equilibrium(offsets, guitar)
     freq0 = calculate_frequencies(starting_x, offsets, guitar)
-    if freq0 is None:
-        return MAX_PENALTY
-    total_cost += np.sum((np.array(starting_freq) - np.array(freq0))**2)
+    residual = starting_freq - freq0
+    total_cost += residual @ residual
 
     str_n = 0
     for real_freq in real_data[1:]:
@@ -248,9 +311,8 @@ def cost1(real_data, guitar):
 
         new_x = find_equilibrium(new_offsets, guitar)
         new_freq = calculate_frequencies(new_x, new_offsets, guitar)
-        if new_freq is None:
-            return MAX_PENALTY
-        total_cost += np.sum((np.array(real_freq) - np.array(new_freq))**2)
+        residual = real_freq - new_freq
+        total_cost += residual @ residual
 
         offsets = new_offsets
 
@@ -263,12 +325,11 @@ def cost2(real_data, guitar):
 
     starting_freq = real_data[-1]
     #print('T_str0 ', guitar.T_str0)
-    offsets = tune_all_targets(starting_freq, guitar)
+    offsets = tune_all_targets_seeded(starting_freq, guitar)
     starting_x = find_equilibrium(offsets, guitar)
     freq0 = calculate_frequencies(starting_x, offsets, guitar)
-    if freq0 is None:
-        return MAX_PENALTY
-    total_cost += np.sum((np.array(starting_freq) - np.array(freq0))**2)
+    residual = starting_freq - freq0
+    total_cost += residual @ residual
 
     str_n = (len(real_data) - 2) % 6
     for real_freq in real_data[-2::-1]:
@@ -277,9 +338,8 @@ def cost2(real_data, guitar):
 
         new_x = find_equilibrium(new_offsets, guitar)
         new_freq = calculate_frequencies(new_x, new_offsets, guitar)
-        if new_freq is None:
-            return MAX_PENALTY
-        total_cost += np.sum((np.array(real_freq) - np.array(new_freq))**2)
+        residual = real_freq - new_freq
+        total_cost += residual @ residual
 
         offsets = new_offsets
 
@@ -290,25 +350,109 @@ def cost2(real_data, guitar):
 def cost3(real_data, guitar):
     total_cost = 0
     for real_freq in real_data:
-        new_offsets = tune_all_targets(real_freq, guitar)
+        new_offsets = tune_all_targets_seeded(real_freq, guitar)
         new_x = find_equilibrium(new_offsets, guitar)
         new_freq = calculate_frequencies(new_x, new_offsets, guitar)
-        if new_freq is None:
-            return MAX_PENALTY
-        total_cost += np.sum((np.array(real_freq) - np.array(new_freq))**2)
-        offsets = new_offsets
+        residual = real_freq - new_freq
+        total_cost += residual @ residual
 
     return total_cost / len(real_data)
 
+def frequency_jacobians(current_offsets, guitar):
+    # Returns the string frequencies and their derivatives with respect to the offsets (6 x 6)
+    # and to the flattened guitar parameters (6 x 27, same layout as Guitar.flatten)
+    current_offsets = np.asarray(current_offsets)
+    x_eq = find_equilibrium(current_offsets, guitar)
+    freqs = calculate_frequencies(x_eq, current_offsets, guitar)
+
+    L_new = guitar.scale_length + x_eq
+    dfreq_dT = 0.5 * np.abs(freqs) / np.maximum(np.abs(guitar.T_str0 + guitar.k_str * (x_eq + current_offsets)), MIN_TENSION)
+    denom = guitar._eq_denom
+
+    # T_spr0 balances T_str0 exactly, so x_eq = -r_str * (k_str . offsets) / denom
+    S = guitar.k_str @ current_offsets
+    dx_offsets = -guitar.r_str * guitar.k_str / denom
+    dx_params = np.zeros(27)
+    dx_params[0] = -S * guitar.r_spr * guitar.k_spr / denom**2
+    dx_params[1] = guitar.r_str * S * guitar.k_spr / denom**2
+    dx_params[2] = guitar.r_str * S * guitar.r_spr / denom**2
+    dx_params[3:9] = -guitar.r_str * current_offsets / denom + guitar.r_str**2 * S / denom**2
+
+    idx = np.arange(6)
+    dT_offsets = guitar.k_str[:, None] * (dx_offsets[None, :] + np.eye(6))
+    jac_offsets = dfreq_dT[:, None] * dT_offsets - freqs[:, None] * dx_offsets[None, :] / L_new[:, None]
+
+    dT_params = guitar.k_str[:, None] * dx_params[None, :]
+    dT_params[idx, 3 + idx] += x_eq + current_offsets
+    dT_params[idx, 9 + idx] += 1
+    dL_params = np.tile(dx_params, (6, 1))
+    dL_params[idx, 15 + idx] += 1
+    dmu_params = np.zeros((6, 27))
+    dmu_params[idx, 21 + idx] = 1
+    jac_params = (
+        dfreq_dT[:, None] * dT_params
+        - freqs[:, None] * (0.5 * dmu_params / guitar.lin_mass_density[:, None] + dL_params / L_new[:, None])
+    )
+
+    return freqs, jac_offsets, jac_params
+
+def tracking_cost_and_grad(rows, str_ns, guitar):
+    # Gradient of the cost1/cost2 walk: offsets are carried forward together with their
+    # sensitivity to the guitar parameters (implicit differentiation of each tuning solve)
+    starting_freq = rows[0]
+    offsets = tune_all_targets_seeded(starting_freq, guitar)
+    freq0, jac_offsets, jac_params = frequency_jacobians(offsets, guitar)
+    d_offsets = -np.linalg.lstsq(jac_offsets, jac_params, rcond=None)[0]
+    residual = starting_freq - freq0
+    total_cost = residual @ residual
+    total_grad = -2 * residual @ (jac_params + jac_offsets @ d_offsets)
+
+    for real_freq, str_n in zip(rows[1:], str_ns):
+        new_offsets = tune_one_target(real_freq[str_n], str_n, guitar, offsets)
+        new_freq, jac_offsets, jac_params = frequency_jacobians(new_offsets, guitar)
+
+        # A clipped offset sits on a bound that moves with the previous offset
+        if offsets[str_n] - 0.001 < new_offsets[str_n] < offsets[str_n] + 0.001:
+            others = np.arange(6) != str_n
+            d_offsets = d_offsets.copy()
+            d_offsets[str_n] = -(
+                jac_params[str_n] + jac_offsets[str_n, others] @ d_offsets[others]
+            ) / jac_offsets[str_n, str_n]
+
+        residual = real_freq - new_freq
+        total_cost += residual @ residual
+        total_grad -= 2 * residual @ (jac_params + jac_offsets @ d_offsets)
+
+        offsets = new_offsets
 
+    return total_cost / len(rows), total_grad / len(rows)
+
+def cost1_and_grad(real_data, guitar):
+    str_ns = [i % 6 for i in range(len(real_data) - 1)]
+    return tracking_cost_and_grad(real_data, str_ns, guitar)
+
+def cost2_and_grad(real_data, guitar):
+    str_ns = [(len(real_data) - 2 - i) % 6 for i in range(len(real_data) - 1)]
+    return tracking_cost_and_grad(real_data[::-1], str_ns, guitar)
+
+def cost3_and_grad(real_data, guitar):
+    total_cost = 0
+    total_grad = np.zeros(27)
+    for real_freq in real_data:
+        new_offsets = tune_all_targets_seeded(real_freq, guitar)
+        new_freq, jac_offsets, jac_params = frequency_jacobians(new_offsets, guitar)
+        d_offsets = -np.linalg.lstsq(jac_offsets, jac_params, rcond=None)[0]
+        residual = real_freq - new_freq
+        total_cost += residual @ residual
+        total_grad -= 2 * residual @ (jac_params + jac_offsets @ d_offsets)
+
+    return total_cost / len(real_data), total_grad / len(real_data)
 
 def generate_artificial_data_reversed(real_data, guitar):
     starting_freq = real_data[0]
     offsets = tune_all_targets(starting_freq, guitar)
     starting_x = find_equilibrium(offsets, guitar)
     freq0 = calculate_frequencies(starting_x, offsets, guitar)
-    if freq0 is None:
-        return None
 
     str_n = len(real_data) - 2
     ret = [freq0]
@@ -318,8 +462,6 @@ def generate_artificial_data_reversed(real_data, guitar):
 
         new_x = find_equilibrium(new_offsets, guitar)
         new_freq = calculate_frequencies(new_x, new_offsets, guitar)
-        if new_freq is None:
-            return None
 
         ret.append(new_freq)
 
@@ -345,6 +487,12 @@ def parameter_objective_function(parameters, real_data):
     #compare_data(artificial_data, real_data)
     return (cost1(real_data, guitar) + cost2(real_data, guitar) + cost3(real_data, guitar))/3
 
+def _shared_parameter_objective_and_grad(parameters, pool):
+    # Only the 27 parameters are sent per task; workers read real_data from shared memory
+    futures = [pool.submit(_cost_on_shared_data, cost, parameters) for cost in (cost1_and_grad, cost2_and_grad, cost3_and_grad)]
+    costs = [f.result() for f in futures]
+    return sum(c for c, _ in costs) / 3, sum(g for _, g in costs) / 3
+
 def make_param_bounds():
     r_str, r_spr, k_spr, k_str, T_str0, scale_length, lin_mass_density = Guitar().to_list()
 
@@ -366,21 +514,40 @@ def make_param_bounds():
 
 
 def optimize_parameters(real_data):
+    real_data = np.asarray(real_data, dtype=np.float64)
     initial_params = Guitar().flatten()
     param_bounds = make_param_bounds()
 
-    result = minimize(
-        lambda x: parameter_objective_function(x, real_data),
-        initial_params,
-        method='L-BFGS-B',  
-        bounds=param_bounds,
-        options={
-            'disp': True,
-            'maxiter': 40,
-            'gtol': 1e-8,   
-            'ftol': 1e-10    
-        }
-    )
+    shm = SharedMemory(create=True, size=real_data.nbytes)
+    try:
+        shared = np.ndarray(real_data.shape, dtype=np.float64, buffer=shm.buf)
+        shared[:] = real_data
+        del shared
+
+        # Workers re-import this module under spawn, so callers must keep
+        # their entry point behind an `if __name__ == '__main__':` guard
+        with ProcessPoolExecutor(
+            max_workers=3,
+            initializer=_attach_real_data,
+            initargs=(shm.name, real_data.shape)
+        ) as pool:
+            result = minimize(
+                _shared_parameter_objective_and_grad,
+                initial_params,
+                args=(pool,),
+                method='trust-constr',
+                jac=True,
+                hess=BFGS(),
+                bounds=Bounds(*np.array(param_bounds).T, keep_feasible=True),
+                options={
+                    'disp': True,
+                    'maxiter': 40,
+                    'gtol': 1e-8
+                }
+            )
+    finally:
+        shm.close()
+        shm.unlink()
 
     return result.x
 
@@ -429,5 +596,7 @@ def test_parameters():
 
             str_n = (str_n + 1) % 6
 
-#calibrate()
-#test_parameters()
\ No newline at end of file
+if __name__ == '__main__':
+    #calibrate()
+    #test_parameters()
+    pass